@@ -0,0 +1,76 @@
+import orjson
+
+import log
+import util
+
+CACHE_FILENAME = "responses.json"
+
+
+class CacheStore:
+    """
+    Persistent, URL-indexed store of API responses and their validators (ETag, Last-Modified), used for making
+    conditional requests. Entries are kept in memory and written to a JSON file in the cache directory on save(), if
+    they have changed since they were loaded or last saved.
+    """
+
+    def __init__(self, cache_dir_path):
+        """
+        Create a new CacheStore, loading any previously saved entries from the given cache directory.
+        :param cache_dir_path: pathlib.Path to the cache directory
+        """
+        self._cache_dir_path = cache_dir_path
+        self._file_path = cache_dir_path.joinpath(CACHE_FILENAME)
+        self._entries = self._load()
+        self._dirty = False
+
+    def _load(self):
+        """
+        Read saved entries from the cache file. A missing or corrupt cache file results in an empty store.
+        :return: dictionary of cache entries, indexed by URL
+        """
+        if not self._file_path.is_file():
+            return {}
+        try:
+            return orjson.loads(self._file_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            log.warning("CACH", f"Failed to read cache file '{self._file_path}', starting with an empty cache.")
+            return {}
+
+    def get(self, url):
+        """
+        Get the cache entry for a given URL.
+        :param url: request URL, including query parameters
+        :return: dictionary with keys etag, last_modified, body and link_header, or None if there is no entry
+        """
+        return self._entries.get(url)
+
+    def put(self, url, etag, last_modified, body, link_header):
+        """
+        Create or replace the cache entry for a given URL. Responses without any validator cannot be used for
+        conditional requests and are not stored.
+        :param url: request URL, including query parameters
+        :param etag: value of the ETag response header, or None
+        :param last_modified: value of the Last-Modified response header, or None
+        :param body: JSON-serializable response body
+        :param link_header: value of the Link response header, or None
+        """
+        if etag is None and last_modified is None:
+            return
+        self._entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "link_header": link_header
+        }
+        self._dirty = True
+
+    def save(self):
+        """
+        Write all entries to the cache file, creating the cache directory if necessary. Does nothing if no entry has
+        changed since the store was loaded or last saved.
+        """
+        if not self._dirty:
+            return
+        util.ensure_directory(self._cache_dir_path)
+        self._file_path.write_bytes(orjson.dumps(self._entries))
+        self._dirty = False
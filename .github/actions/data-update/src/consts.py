@@ -1,13 +1,28 @@
 # Env var names
 ENV_GITHUB_PAT = "INPUT_GITHUB_PAT"
 ENV_DATA_DIR = "INPUT_DATA_DIR"
+ENV_CACHE_DIR = "INPUT_CACHE_DIR"
 
 # API and rate limits
-API_REQUEST_DELAY_SEC = 1
 RATE_LIMIT_BUFFER_SEC = 60
 RATE_LIMIT_MAX_AGE_SEC = 30
-MAX_RETRIES = 0
+MAX_RETRIES = 3
+MAX_RATE_LIMIT_WAITS = 3
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+MAX_CONCURRENT_REQUESTS = 5
+PER_PAGE = 100
+USE_GRAPHQL_MEMBERS = True
+RESULT_CACHE_TTL_SEC = 300
+REQUEST_TIMEOUT_SEC = 30
+BACKOFF_BASE_SEC = 1
+BACKOFF_CAP_SEC = 60
+BACKOFF_JITTER = 0.5
+
+# Logging
+LOG_LEVEL = "INFO"
+TIME_FORMAT_PATTERN = "%Y/%m/%d %H:%M:%S"
 
 # Files
+DEFAULT_CACHE_DIR = ".api_cache"
 CONTRIBUTIONS_FILENAME = "contributions.json"
 PEOPLE_FILENAME = "people.json"
@@ -11,12 +11,13 @@ class Context:
     Represents an application context containing shared information such as configurations, paths and secrets.
     """
 
-    def __init__(self, out_dir_path, github_token):
+    def __init__(self, out_dir_path, github_token, cache_dir_path):
         """
         Private constructor.
         """
         self._data_dir_path = out_dir_path
         self._github_token = github_token
+        self._cache_dir_path = cache_dir_path
 
     @staticmethod
     def _read_env_var(var_name):
@@ -26,15 +27,19 @@ class Context:
         return val
 
     @staticmethod
-    def create():
+    def create(use_cache=True):
         """
         Read environment variables and create a new Context.
+        :param use_cache: whether API responses should be cached between runs (True)
         :return: newly created Context object
         """
         data_dir_path = Path(Context._read_env_var(consts.ENV_DATA_DIR))
         github_pat = Context._read_env_var(consts.ENV_GITHUB_PAT)
         util.ensure_directory(data_dir_path)
-        return Context(data_dir_path, github_pat)
+        cache_dir_path = None
+        if use_cache:
+            cache_dir_path = Path(os.getenv(consts.ENV_CACHE_DIR) or consts.DEFAULT_CACHE_DIR)
+        return Context(data_dir_path, github_pat, cache_dir_path)
 
     def get_github_token(self):
         """
@@ -49,3 +54,10 @@ class Context:
         :return: Path to the data directory
         """
         return self._data_dir_path
+
+    def get_cache_dir_path(self):
+        """
+        Get the pathlib.Path to the API response cache directory.
+        :return: Path to the cache directory, or None if caching is disabled
+        """
+        return self._cache_dir_path
@@ -1,15 +1,32 @@
+import asyncio
+import random
 import time
+import urllib.parse
 
-import requests
-import re
+import httpx
+import orjson
 
 import consts
 import json_reducer
+from cache_store import CacheStore
 import log
 import util
 
 ORG = 'zuehlke'
 BASE_URL = "https://api.github.com"
+GRAPHQL_URL = f"{BASE_URL}/graphql"
+
+# Rate limit resources, as indicated by the X-RateLimit-Resource header. Each resource has a separate budget.
+CORE_RESOURCE = "core"
+GRAPHQL_RESOURCE = "graphql"
+
+# Link header relation parameters and their corresponding cursor keys.
+LINK_RELATIONS = {
+    'rel="next"': "next",
+    'rel="last"': "last",
+    'rel="first"': "first",
+    'rel="prev"': "prev",
+}
 
 REPOS_SCHEMA = [{
     "id": {},
@@ -38,6 +55,31 @@ PERSON_SCHEMA = {
     "html_url": {},
 }
 
+ORG_MEMBERS_QUERY = """
+query($org: String!, $first: Int!, $cursor: String) {
+  organization(login: $org) {
+    membersWithRole(first: $first, after: $cursor) {
+      nodes {
+        databaseId
+        login
+        name
+        bio
+        avatarUrl
+        url
+      }
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
+    }
+  }
+}
+"""
+
+
+class GitHubApiError(Exception):
+    """Raised when a request to the GitHub API fails irrecoverably."""
+
 
 class GitHubApi:
     """Provides a wrapper for fetching data from GitHub API."""
@@ -49,7 +91,53 @@ class GitHubApi:
         """
         self._context = context
         self._api_token = context.get_github_token()
-        self._rate_limit_status = None
+        self._rate_limit_statuses = {}
+        self._session = None
+        self._semaphore = None
+        self._ttl_cache = {}
+        self._max_retries = consts.MAX_RETRIES
+        self._max_rate_limit_waits = consts.MAX_RATE_LIMIT_WAITS
+        self._retryable_status_codes = consts.RETRYABLE_STATUS_CODES
+        self._use_graphql_members = consts.USE_GRAPHQL_MEMBERS
+        self._rate_limit_buffer_sec = consts.RATE_LIMIT_BUFFER_SEC
+        self._rate_limit_max_age_sec = consts.RATE_LIMIT_MAX_AGE_SEC
+        self._backoff_base_sec = consts.BACKOFF_BASE_SEC
+        self._backoff_cap_sec = consts.BACKOFF_CAP_SEC
+        self._backoff_jitter = consts.BACKOFF_JITTER
+        cache_dir_path = context.get_cache_dir_path()
+        self._cache = CacheStore(cache_dir_path) if cache_dir_path is not None else None
+
+    def _run(self, coroutine):
+        """
+        Run a coroutine to completion on a new event loop, within a fresh client session. Abort if the coroutine fails
+        with a GitHubApiError - this happens here rather than within the coroutine, where concurrent tasks may still be
+        running.
+        :param coroutine: coroutine to be run
+        :return: result of the coroutine
+        """
+        try:
+            return asyncio.run(self._run_in_session(coroutine))
+        except GitHubApiError as ex:
+            log.abort_and_exit("GHUB", str(ex))
+
+    async def _run_in_session(self, coroutine):
+        """
+        Open a client session and a concurrency gate for the current event loop, await the given coroutine and close
+        the session again. The session keeps its connections alive and multiplexes concurrent requests over a single
+        HTTP/2 connection where the server supports it.
+        :param coroutine: coroutine to be awaited
+        :return: result of the coroutine
+        """
+        async with httpx.AsyncClient(http2=True, timeout=consts.REQUEST_TIMEOUT_SEC) as session:
+            self._session = session
+            self._semaphore = asyncio.Semaphore(consts.MAX_CONCURRENT_REQUESTS)
+            try:
+                return await coroutine
+            finally:
+                self._session = None
+                self._semaphore = None
+                if self._cache is not None:
+                    self._cache.save()
 
     def _get_authorization_header(self):
         """
@@ -58,18 +146,69 @@ class GitHubApi:
         """
         return f"token {self._context.get_github_token()}"
 
-    def _handle_rate_limit(self):
+    async def _handle_rate_limit(self, retry_after_sec=0, resource=CORE_RESOURCE):
+        """
+        Sleep until rate limit block is lifted, plus additional time specified in the config file. The block is
+        considered lifted after the server-provided Retry-After delay, or at the rate limit reset if the rate limit is
+        exhausted, whichever is later. The rate limit status from the latest response is authoritative, it is only
+        requested separately for the core resource if no response has provided it yet.
+        :param retry_after_sec: value of the Retry-After header, if any (0)
+        :param resource: rate limit resource which is blocked (CORE_RESOURCE)
+        """
+        if (resource == CORE_RESOURCE) and (CORE_RESOURCE not in self._rate_limit_statuses):
+            await self._update_rate_limit_status()
+        status = self._rate_limit_statuses.get(resource)
+        reset_in_sec = 0
+        if (status is not None) and (status["remaining"] <= 0):
+            reset_in_sec = max(status["reset_at_utc"] - round(time.time()), 0)
+        sleep_duration = max(retry_after_sec, reset_in_sec) + self._rate_limit_buffer_sec
+        wakeup_time = util.epoch_to_local_datetime(time.time() + sleep_duration)
+        log.warning("GHUB", "Rate limit reached - sleeping for %ss until %s.", sleep_duration, wakeup_time)
+        await asyncio.sleep(sleep_duration)
+
+    async def _acquire_rate_limit_budget(self, resource=CORE_RESOURCE):
+        """
+        Consume one request from the remaining rate limit budget, as known from the latest response headers. If the
+        budget is exhausted, sleep until the rate limit is reset instead of provoking a rate-limited response. The
+        budget is tracked locally between responses, so this does not require any additional requests.
+        :param resource: rate limit resource of the request (CORE_RESOURCE)
+        """
+        status = self._rate_limit_statuses.get(resource)
+        if (status is None) or (status["reset_at_utc"] <= time.time()):
+            # Status is unknown or the rate limit has been reset since - the next response provides the current status.
+            return
+        if status["remaining"] <= 0:
+            await self._handle_rate_limit(resource=resource)
+        else:
+            status["remaining"] -= 1
+            status["used"] += 1
+
+    @staticmethod
+    async def _gather(coroutines):
         """
-        Sleep until rate limit block is lifted, plus additional time specified in the config file. Update rate limit
-        status as needed.
+        Run coroutines concurrently and return their results, like asyncio.gather(). If one of them fails, all others
+        are cancelled before the error is propagated, so no request outlives a failed collection.
+        :param coroutines: list of coroutines
+        :return: list of results, in the order of the given coroutines
         """
-        if self.is_rate_limit_status_stale():
-            self.update_rate_limit_status()
-        sleep_duration = self._rate_limit_status["reset_in_sec"] + consts.RATE_LIMIT_BUFFER_SEC
-        time.sleep(sleep_duration)
-        wakeup_time = util.epoch_to_local_datetime(self._rate_limit_status["reset_at_utc"])
-        log.warning("GHUB", f"Rate limit reached - sleeping for {sleep_duration}s until {wakeup_time}.")
-        time.sleep(sleep_duration)
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _backoff(self, attempt):
+        """
+        Sleep for an exponentially increasing, capped and jittered delay before retrying a failed request.
+        :param attempt: number of retries that have already occurred for this request
+        """
+        delay = min(self._backoff_base_sec * 2 ** attempt, self._backoff_cap_sec)
+        delay *= 1 + random.random() * self._backoff_jitter
+        log.warning("GHUB", "Backing off for %.1fs before retrying.", delay)
+        await asyncio.sleep(delay)
 
     def _preprocess_repos(self, repos_list):
         """
@@ -79,7 +218,7 @@ class GitHubApi:
         """
         return [repo for repo in repos_list if not repo["private"]]
 
-    def _get_repo_contributors(self, owner, repo):
+    async def _get_repo_contributors(self, owner, repo):
         """
         Fetch list of contributors for a given repository, identified by owner and repo name.
         :param owner: owner of the repository
@@ -87,23 +226,23 @@ class GitHubApi:
         :return: list of contributors as returned by the GitHub API
         """
         url = f"{BASE_URL}/repos/{owner}/{repo}/contributors"
-        return self.fetch_all_pages(url, flatten=True, query_params={"per_page": 100})
+        return await self._fetch_all_pages(url, flatten=True)
 
-    def _get_org_members(self):
+    async def _get_org_members(self):
         """
         Fetch list of members of the Zuehlke GitHub organisation.
         :return: list of members of the Zuehlke org as returned by the GitHub API
         """
         url = f"{BASE_URL}/orgs/{ORG}/members"
-        return self.fetch_all_pages(url, flatten=True, query_params={"per_page": 100})
+        return await self._fetch_all_pages(url, flatten=True)
 
-    def _get_org_repos(self):
+    async def _get_org_repos(self):
         """
         Fetch list of repositories owned by the Zuehlke GitHub organisation.
         :return: list of repos owned by the Zuehlke org as returned by the GitHub API
         """
         url = f"{BASE_URL}/orgs/{ORG}/repos"
-        return self.fetch_all_pages(url, flatten=True, query_params={"per_page": 100})
+        return await self._fetch_all_pages(url, flatten=True)
 
     @staticmethod
     def _parse_link_header(link_header):
@@ -125,31 +264,44 @@ class GitHubApi:
         for link in links:
             parts = link.split(";")
             if len(parts) != 2:
-                log.abort_and_exit("GHUB", f"Failed to parse Link header: '{link_header}'.")
+                raise GitHubApiError(f"Failed to parse Link header: '{link_header}'.")
             url = parts[0].strip()[1:-1]
-            rel = parts[1]
-            if re.match('rel="next"', rel.strip()):
-                result["next"] = url
-            elif re.match('rel="last"', rel.strip()):
-                result["last"] = url
-            elif re.match('rel="first"', rel.strip()):
-                result["first"] = url
-            elif re.match('rel="prev"', rel.strip()):
-                result["prev"] = url
+            key = LINK_RELATIONS.get(parts[1].strip())
+            if key is not None:
+                result[key] = url
         return result
 
-    def update_rate_limit_status(self):
-        """
-        Fetch latest rate limit status and update status information in this object. Uses an API endpoint
+    @staticmethod
+    def _get_page_urls(last_url):
+        """
+        Derive the URLs of all pages after the first one from the URL of the last page, as provided in the Link header.
+        :param last_url: URL of the last page
+        :return: list of URLs of pages 2 to last, in order, or None if the last page number cannot be determined
+        """
+        split_url = urllib.parse.urlsplit(last_url)
+        query = urllib.parse.parse_qs(split_url.query, keep_blank_values=True)
+        last_page = query.get("page", [""])[0]
+        if not last_page.isdigit():
+            return None
+        page_urls = []
+        for page_number in range(2, int(last_page) + 1):
+            query["page"] = [str(page_number)]
+            page_query = urllib.parse.urlencode(query, doseq=True)
+            page_urls.append(urllib.parse.urlunsplit(split_url._replace(query=page_query)))
+        return page_urls
+
+    async def _update_rate_limit_status(self):
+        """
+        Fetch latest core rate limit status and update status information in this object. Uses an API endpoint
         which is itself not rate-limited, and is therefore not affected by any rate limit blocks. Information
         is presented in a pre-defined rate limit status information dictionary format.
         """
         headers = {"Authorization": self._get_authorization_header()}
-        res = requests.get(f"{BASE_URL}/rate_limit", headers=headers)
+        res = await self._session.get(f"{BASE_URL}/rate_limit", headers=headers)
         if res.status_code != 200:
-            log.abort_and_exit("GHUB", f"Failed to update rate limit status, status code {res.status_code}.")
-        data = res.json()["rate"]
-        self._rate_limit_status = {
+            raise GitHubApiError(f"Failed to update rate limit status, status code {res.status_code}.")
+        data = orjson.loads(res.content)["rate"]
+        self._rate_limit_statuses[CORE_RESOURCE] = {
             "limit": int(data["limit"]),
             "used": int(data["used"]),
             "remaining": int(data["remaining"]),
@@ -160,37 +312,50 @@ class GitHubApi:
 
     def is_rate_limit_status_stale(self):
         """
-        Whether the latest rate limit update is older than the maximum allowed age specified in the
+        Whether the latest core rate limit update is older than the maximum allowed age specified in the
         config file.
-        :return: True of the current rate limit status information is stale, False else
+        :return: True of the current rate limit status information is stale or missing, False else
         """
-        if self._rate_limit_status is None:
-            self.update_rate_limit_status()
-        max_age_sec = consts.RATE_LIMIT_MAX_AGE_SEC
-        return (round(time.time()) - self._rate_limit_status["last_update"]) > max_age_sec
+        status = self._rate_limit_statuses.get(CORE_RESOURCE)
+        if status is None:
+            return True
+        return (round(time.time()) - status["last_update"]) > self._rate_limit_max_age_sec
 
     def request_rate_limit_status(self, force_update=False, ignore_stale=False):
         """
-        Get current rate limit status information, triggering status update request if the current
+        Get current core rate limit status information, triggering status update request if the current
         information is stale.
         :param force_update: force status update request (False)
         :param ignore_stale: stale status information does not require a status update request (False)
         :return: current rate limit status information
         """
-        if self._rate_limit_status is None:
-            self.update_rate_limit_status()
-        if force_update or (self.is_rate_limit_status_stale() and not ignore_stale):
-            self.update_rate_limit_status()
-        return self._rate_limit_status
+        return self._run(self._request_rate_limit_status(force_update, ignore_stale))
 
-    def is_rate_limited(self, force_update=False, ignore_stale=False):
+    async def _request_rate_limit_status(self, force_update=False, ignore_stale=False):
+        """
+        Coroutine counterpart of request_rate_limit_status(), for use within a running client session.
+        :param force_update: force status update request (False)
+        :param ignore_stale: stale status information does not require a status update request (False)
+        :return: current rate limit status information
+        """
+        stale = self.is_rate_limit_status_stale() and not ignore_stale
+        if (CORE_RESOURCE not in self._rate_limit_statuses) or force_update or stale:
+            await self._update_rate_limit_status()
+        return self._rate_limit_statuses[CORE_RESOURCE]
+
+    async def _is_rate_limited(self, force_update=False, ignore_stale=False, resource=CORE_RESOURCE):
         """
         Whether the authenticated user is currently blocked by rate limitation.
         :param force_update: force rate limit status update request (is allowed during rate limit blocks) (False)
         :param ignore_stale: allow using stale rate limit information for answering this query (False)
+        :param resource: rate limit resource to check (CORE_RESOURCE)
         :return: True if currently blocked by rate limitation, False else
         """
-        status = self.request_rate_limit_status(force_update, ignore_stale)
+        if resource != CORE_RESOURCE:
+            # Only the core status can be requested separately, other statuses are known from response headers only.
+            status = self._rate_limit_statuses.get(resource)
+            return (status is not None) and (status["remaining"] <= 0)
+        status = await self._request_rate_limit_status(force_update, ignore_stale)
         return status["remaining"] <= 0
 
     @staticmethod
@@ -213,24 +378,41 @@ class GitHubApi:
             "last_update": round(time.time())
         }
 
-    def get(self, url, authenticate=True, headers=None, query_params=None, expected_status_codes=None, retry=0):
+    async def _get(self, url, authenticate=True, headers=None, query_params=None, expected_status_codes=None):
+        """
+        Perform a GET request to the GitHub API. See _request().
+        :param url: request URL, not including query parameters
+        :param authenticate: whether this request should include the appropriate Authorization header (True)
+        :param headers: additional custom headers (not including Authorization) (None)
+        :param query_params: query parameters dictionary (None)
+        :param expected_status_codes: list of status codes for which no retry is necessary ([200, 204])
+        :return: status, response_json, cursor
+        """
+        return await self._request("GET", url, authenticate, headers, query_params, expected_status_codes)
+
+    async def _request(self, method, url, authenticate=True, headers=None, query_params=None,
+                       expected_status_codes=None, json_body=None):
         """
-        Perform a GET request to the GitHub API. Appropriately handle rate limits. Retry if failed due to rate limiting
-        or unexpected response code. Fail if no success after reaching maximum number of retries as specified in the
-        config file. Return the status code, response JSON, and cursor object containing next, first, last and prev
-        links.
+        Perform a request to the GitHub API. Appropriately handle rate limits. Retry if failed due to rate limiting
+        or a transient error (see consts.RETRYABLE_STATUS_CODES, as well as timeouts and connection errors), fail
+        immediately on any other unexpected response code. Fail if no success after reaching the maximum number of
+        retries or rate limit waits, as specified in the config file. Waiting for a rate limit to be lifted does not
+        count as a retry. Return the status code, response JSON, and cursor object containing next, first, last and
+        prev links. If caching is enabled, the request is made conditional on the validators of a previously cached
+        response, and a 304 Not Modified response is answered from the cache with status 200. Only GET requests are
+        cached. Failures are raised as GitHubApiError.
+        :param method: HTTP method
         :param url: request URL, not including query parameters
         :param authenticate: whether this request should include the appropriate Authorization header (True)
         :param headers: additional custom headers (not including Authorization) (None)
         :param query_params: query parameters dictionary (None)
         :param expected_status_codes: list of status codes for which no retry is necessary ([200, 204])
-        :param retry: how many retries have already occurred (0)
+        :param json_body: JSON-serializable request body (None)
         :return: status, response_json, cursor
         """
 
-        # Initialize headers if not provided.
-        if headers is None:
-            headers = {}
+        # Initialize headers if not provided, copy them otherwise - they are modified per request.
+        headers = {} if headers is None else dict(headers)
 
         # Set expected status codes to default value if not provided.
         if expected_status_codes is None:
@@ -246,46 +428,97 @@ class GitHubApi:
             for key, value in query_params.items():
                 url = f"{url}{key}={value}&"
 
-        # If max number of retries is exceeded, abort.
-        if retry > consts.MAX_RETRIES:
-            log.abort_and_exit("GHUB", f"Request to {url} with headers {headers} failed after {retry} retries.")
-
-        # Sleep before making request to ensure proper delay.
-        time.sleep(consts.API_REQUEST_DELAY_SEC)
-
-        # Before making a request, check for rate limiting. Wait if necessary.
-        if self.is_rate_limited():
-            self._handle_rate_limit()
-
-        # Make request and update rate limit status from response headers.
-        response = requests.get(url, headers=headers)
-        self._rate_limit_status = self._parse_rate_limit_headers(response.headers)
-        status = response.status_code
-
-        retry_after_header = response.headers.get("Retry-After")
-        if retry_after_header is not None:
-            # Retry-After header found, indicates abuse rate limiting. Discard response, wait and retry.
-            retry_sec = int(retry_after_header)
-            log.warning("GHUB",
-                        f"Received Retry-After (abuse rate limiting), trying again after '{retry_sec}' seconds.")
-            self.update_rate_limit_status()
-            self.get(url, headers, expected_status_codes, retry + 1)
-
-        if (status == 403) or (status not in expected_status_codes):
-            # Check for rate limiting in case of unexpected status code.
-            if self.is_rate_limited():
-                # Wait until the rate limit should be lifted.
-                self._handle_rate_limit()
+        # Make the request conditional if a previous response for this URL is cached.
+        use_cache = (self._cache is not None) and (method == "GET")
+        cached = self._cache.get(url) if use_cache else None
+        if cached is not None:
+            if cached["etag"] is not None:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"] is not None:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        # Requests to the GraphQL API are rate limited separately from the REST API.
+        resource = GRAPHQL_RESOURCE if url == GRAPHQL_URL else CORE_RESOURCE
+
+        # Retries after transient errors and waits for rate limits to be lifted are limited separately.
+        retry = 0
+        rate_limit_waits = 0
+        while retry <= self._max_retries:
+            # Limit the number of requests in flight at the same time.
+            async with self._semaphore:
+                # Before making a request, wait until the remaining rate limit budget allows it.
+                await self._acquire_rate_limit_budget(resource)
+
+                # Make request and update rate limit status from response headers.
+                try:
+                    response = await self._session.request(method, url, headers=headers, json=json_body)
+                except httpx.TransportError as ex:
+                    # Timeouts and connection errors are transient errors as well, without any response.
+                    log.warning("GHUB", "Request %s failed with %s: %s", url, type(ex).__name__, ex)
+                    response = None
+
+            if response is None:
+                # Back off outside of the concurrency gate, like for a transient error status code.
+                if retry < self._max_retries:
+                    await self._backoff(retry)
+                retry += 1
+                continue
+
+            if "X-RateLimit-Remaining" in response.headers:
+                response_resource = response.headers.get("X-RateLimit-Resource", resource)
+                self._rate_limit_statuses[response_resource] = self._parse_rate_limit_headers(response.headers)
+            status = response.status_code
+            if status == 304 and cached is not None:
+                # Not modified - reuse the cached response.
+                status = 200
+                response_json = cached["body"]
+                link_header = cached["link_header"]
+            elif (status != 403) and (status in expected_status_codes):
+                # Only parse expected responses - error responses may not be JSON, e.g. error pages of a proxy.
+                response_json = orjson.loads(response.content) if response.content else None
+                link_header = response.headers.get("Link")
+                if status == 200 and use_cache:
+                    self._cache.put(url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                                    response_json, link_header)
             else:
-                # It was not a rate limiting issue - log a warning.
-                log.warning("GHUB", f"Unexpected status code {status} for request {url}.")
-
-            # Rate limit should now be lifted if there was one. Retry, update number of retries.
-            self.get(url, headers, expected_status_codes, retry + 1)
+                response_json = None
+                link_header = None
+
+            retry_after_header = response.headers.get("Retry-After")
+            if retry_after_header is not None:
+                # Retry-After header found, indicates abuse rate limiting. Discard response, wait and retry.
+                if rate_limit_waits >= self._max_rate_limit_waits:
+                    break
+                retry_sec = int(retry_after_header)
+                log.warning("GHUB", "Received Retry-After (abuse rate limiting), trying again after '%s' seconds.",
+                            retry_sec)
+                await self._handle_rate_limit(retry_sec, resource)
+                rate_limit_waits += 1
+            elif (status == 403) or (status not in expected_status_codes):
+                # Check for rate limiting in case of unexpected status code. The status is kept up to date from the
+                # response headers, so it is not requested again.
+                if await self._is_rate_limited(ignore_stale=True, resource=resource):
+                    # Wait until the rate limit should be lifted, then retry.
+                    if rate_limit_waits >= self._max_rate_limit_waits:
+                        break
+                    await self._handle_rate_limit(resource=resource)
+                    rate_limit_waits += 1
+                elif status in self._retryable_status_codes:
+                    # It was a transient error - log a warning and back off before retrying.
+                    log.warning("GHUB", "Unexpected status code %s for request %s.", status, url)
+                    if retry < self._max_retries:
+                        await self._backoff(retry)
+                    retry += 1
+                else:
+                    # Neither rate limiting nor a transient error - retrying would not change the outcome.
+                    raise GitHubApiError(f"Request to {url} failed with unrecoverable status code {status}.")
+            else:
+                return status, response_json, self._parse_link_header(link_header)
 
-        return status, response.json(), self._parse_link_header(response.headers.get("Link"))
+        # Max number of retries or rate limit waits is exceeded, abort.
+        raise GitHubApiError(f"Request to {url} failed after {retry} retries and {rate_limit_waits} rate limit waits.")
 
-    def request_page(self, url, authenticate=True, headers=None, query_params=None, expected_status_codes=None):
+    async def _request_page(self, url, authenticate=True, headers=None, query_params=None, expected_status_codes=None):
         """
         Perform a GET request to a potentially paginated resource in the GitHub API. Return a list containing all
         items on that page, and a cursor object. This method can also be used for non-paginated responses. It returns
@@ -297,15 +530,15 @@ class GitHubApi:
         :param expected_status_codes: response codes for which no retry is necessary ([200, 204])
         :return: result_list, cursor
         """
-        log.info("GHUB", f"Fetching page '{url}'.")
-        _, data, cursor = self.get(url, authenticate, headers, query_params, expected_status_codes)
+        log.info("GHUB", "Fetching page '%s'.", url)
+        _, data, cursor = await self._get(url, authenticate, headers, query_params, expected_status_codes)
         page = data
         if type(data) is not list:
             page = [data]
         return cursor, page
 
-    def fetch_all_pages(self, initial_url, flatten=False, authenticate=True, headers=None, query_params=None,
-                        expected_status_codes=None):
+    async def _fetch_all_pages(self, initial_url, flatten=False, authenticate=True, headers=None, query_params=None,
+                               expected_status_codes=None):
         """
         Perform a series of GET requests to a potentially paginated resource in the GitHub API and return results as
         a single list.
@@ -314,49 +547,149 @@ class GitHubApi:
         for each page (False)
         :param authenticate: whether to provide appropriate Authorization header (True)
         :param headers: custom headers (None)
-        :param query_params: query parameters dictionary (None)
+        :param query_params: query parameters dictionary, per_page defaults to the maximum page size (None)
         :param expected_status_codes: response codes for which no retry is necessary ([200, 204])
         :return: list of page results, potentially flattened
         """
-        result = []
-        current_url = initial_url
-        while current_url is not None:
-            cursor, page = self.request_page(current_url, authenticate, headers, query_params, expected_status_codes)
-            if flatten:
-                for element in page:
-                    result.append(element)
-            else:
-                result.append(page)
-            # Update url with the "next" link, unless we just called the URL indicated as "last".
+        # Request the maximum page size unless specified otherwise, to minimize the number of pages.
+        query_params = {"per_page": consts.PER_PAGE, **(query_params or {})}
+
+        # Fetch the first page, which indicates the remaining pages in its Link header.
+        cursor, first_page = await self._request_page(initial_url, authenticate, headers, query_params,
+                                                      expected_status_codes)
+        pages = [first_page]
+
+        # Links already include the query params of the initial request, they must not be appended again.
+        page_urls = self._get_page_urls(cursor["last"]) if cursor["last"] is not None else None
+        if page_urls is not None:
+            # The number of pages is known, fetch all remaining pages concurrently.
+            responses = await self._gather([
+                self._request_page(page_url, authenticate, headers, None, expected_status_codes)
+                for page_url in page_urls
+            ])
+            pages.extend(page for _, page in responses)
+        else:
+            # Follow the "next" links one by one, unless we just called the URL indicated as "last".
             # This is required because a "next" link may returned when requesting the last page.
-            current_url = cursor["next"] if not (current_url == cursor["last"]) else None
+            current_url = cursor["next"] if not (initial_url == cursor["last"]) else None
+            while current_url is not None:
+                cursor, page = await self._request_page(current_url, authenticate, headers, None,
+                                                        expected_status_codes)
+                pages.append(page)
+                current_url = cursor["next"] if not (current_url == cursor["last"]) else None
+
+        if not flatten:
+            return pages
+        result = []
+        for page in pages:
+            result.extend(page)
         return result
 
+    def invalidate(self):
+        """
+        Discard all memoized collection results, such that the next collection fetches fresh data.
+        """
+        self._ttl_cache.clear()
+
+    @util.ttl_cache(consts.RESULT_CACHE_TTL_SEC)
     def collect_org_repos(self):
         """
-        Get and aggregate all public repositories owned by the Zuehlke org.
-        :return: id-indexed dictionary containing all aggregated public Zuehlke org repos
+        Get and aggregate all public repositories owned by the Zuehlke org. The result is memoized for a limited time,
+        see invalidate().
+        :return: list containing all aggregated public Zuehlke org repos
+        """
+        return self._run(self._collect_org_repos())
+
+    async def _collect_org_repos(self):
+        """
+        Coroutine counterpart of collect_org_repos(), for use within a running client session.
+        :return: list containing all aggregated public Zuehlke org repos
         """
         log.info("GHUB", "Collecting org repos.")
-        raw_repos = self._get_org_repos()
+        raw_repos = await self._get_org_repos()
         preprocessed_repos = self._preprocess_repos(raw_repos)
-        parsed_repos = json_reducer.reduce(REPOS_SCHEMA, preprocessed_repos)
-        result = []
-        for repo in parsed_repos:
-            result.append(repo)
-        return result
+        return json_reducer.compile_schema(REPOS_SCHEMA)(preprocessed_repos)
 
+    @util.ttl_cache(consts.RESULT_CACHE_TTL_SEC)
     def collect_org_members(self):
         """
-        Get and aggregate all non-concealed members of the Zühlke org.
-        :return: id-indexed dictionary containing all aggregated non-concealed members of the Zühlke org.
+        Get and aggregate all non-concealed members of the Zühlke org. The result is memoized for a limited time, see
+        invalidate().
+        :return: list containing all aggregated non-concealed members of the Zühlke org.
+        """
+        return self._run(self._collect_org_members())
+
+    async def _collect_org_members(self):
+        """
+        Coroutine counterpart of collect_org_members(), for use within a running client session. Uses the GraphQL API
+        unless disabled in the config file, in which case member details are fetched from the REST API.
+        :return: list containing all aggregated non-concealed members of the Zühlke org.
         """
         log.info("GHUB", "Collecting org members.")
-        member_urls = [member["url"] for member in self._get_org_members()]
+        if self._use_graphql_members:
+            return await self._collect_org_members_graphql()
+        return await self._collect_org_members_rest()
+
+    async def _collect_org_members_rest(self):
+        """
+        Collect org members from the REST API, which requires one request per member. Member details are fetched
+        concurrently, limited by the configured maximum number of concurrent requests.
+        :return: list containing all aggregated non-concealed members of the Zühlke org.
+        """
+        member_urls = [member["url"] for member in await self._get_org_members()]
+        responses = await self._gather([self._get_member(member_url) for member_url in member_urls])
+        reduce_member = json_reducer.compile_schema(PERSON_SCHEMA)
+        return [reduce_member(member_raw) for _, member_raw, _ in responses]
+
+    async def _collect_org_members_graphql(self):
+        """
+        Collect org members from the GraphQL API, which returns the details of up to one page of members per request.
+        Members are transformed into the PERSON_SCHEMA format and ordered by login, like the REST API does.
+        :return: list containing all aggregated non-concealed members of the Zühlke org.
+        """
         members = []
-        for member_url in member_urls:
-            log.info("GHUB", f"Fetching member '{member_url}'.")
-            _, member_raw, _ = self.get(member_url)
-            member_parsed = json_reducer.reduce(PERSON_SCHEMA, member_raw)
-            members.append(member_parsed)
+        cursor = None
+        has_next_page = True
+        page_number = 1
+        while has_next_page:
+            log.info("GHUB", "Fetching members page %s from GraphQL API.", page_number)
+            variables = {"org": ORG, "first": consts.PER_PAGE, "cursor": cursor}
+            data = await self._post_graphql(ORG_MEMBERS_QUERY, variables)
+            connection = data["organization"]["membersWithRole"]
+            members.extend({
+                "id": node["databaseId"],
+                "login": node["login"],
+                "name": node["name"],
+                "bio": node["bio"] or None,
+                "avatar_url": node["avatarUrl"],
+                "html_url": node["url"],
+            } for node in connection["nodes"])
+            cursor = connection["pageInfo"]["endCursor"]
+            has_next_page = connection["pageInfo"]["hasNextPage"]
+            page_number += 1
+        members.sort(key=lambda member: member["login"].lower())
         return members
+
+    async def _post_graphql(self, query, variables):
+        """
+        Perform a query against the GitHub GraphQL API. Fail if the response is empty or contains any errors.
+        :param query: GraphQL query document
+        :param variables: dictionary of query variables
+        :return: data object of the response
+        """
+        body = {"query": query, "variables": variables}
+        _, response_json, _ = await self._request("POST", GRAPHQL_URL, json_body=body)
+        if response_json is None:
+            raise GitHubApiError("GraphQL query returned an empty response.")
+        if response_json.get("errors"):
+            raise GitHubApiError(f"GraphQL query failed: {response_json['errors']}.")
+        return response_json["data"]
+
+    async def _get_member(self, member_url):
+        """
+        Fetch the full profile of a single org member.
+        :param member_url: API URL of the member
+        :return: status, response_json, cursor
+        """
+        log.info("GHUB", "Fetching member '%s'.", member_url)
+        return await self._get(member_url)
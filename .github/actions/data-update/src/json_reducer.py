@@ -22,3 +22,62 @@ def reduce(schema_node, json_node):
         result[key] = reduce(schema_value, json_node[key])
     return result
 
+
+# Compiled reducers, indexed by id of their schema. The schema is kept alongside to keep its id valid.
+_compiled_reducers = {}
+
+
+def compile_schema(schema_node):
+    """
+    Compile a schema into a reducer function, such that compile_schema(schema)(json_node) is equivalent to
+    reduce(schema, json_node). The schema is interpreted only once, which makes the compiled reducer cheaper when
+    reducing many JSON nodes with the same schema. Compiled reducers are cached per schema object.
+    :param schema_node: schema defining the expected reduction
+    :return: function reducing a JSON node (object or array) according to the given schema
+    """
+    cached = _compiled_reducers.get(id(schema_node))
+    if (cached is not None) and (cached[0] is schema_node):
+        return cached[1]
+    reducer = _compile_node(schema_node)
+    _compiled_reducers[id(schema_node)] = (schema_node, reducer)
+    return reducer
+
+
+def _select_all(json_node):
+    """
+    Reducer for the base case, which selects the full JSON node.
+    :param json_node: JSON node (object or array)
+    :return: the given JSON node
+    """
+    return json_node
+
+
+def _compile_node(schema_node):
+    """
+    Recursively compile a schema node into a reducer function. See compile_schema().
+    :param schema_node: schema defining the expected reduction
+    :return: function reducing a JSON node (object or array) according to the given schema node
+    """
+    if (schema_node == {}) or (schema_node == []):
+        # Base case - this JSON node does not need to be further reduced.
+        return _select_all
+    if type(schema_node) is list:
+        # Schema expects this JSON node to be a list - reduce children individually and collect results.
+        assert len(schema_node) == 1, "List schema node can only contain 0 or 1 elements."
+        reduce_item = _compile_node(schema_node[0])
+
+        def reduce_list(json_node):
+            assert type(json_node) is list, "Schema expected list, but JSON node was not list."
+            return [reduce_item(item) for item in json_node]
+        return reduce_list
+
+    # Process this node as a dictionary. Children selected in full are copied without a reducer call.
+    children = [(key, _compile_node(schema_value)) for key, schema_value in schema_node.items()]
+    children = [(key, None if reduce_child is _select_all else reduce_child) for key, reduce_child in children]
+
+    def reduce_dict(json_node):
+        return {
+            key: json_node[key] if reduce_child is None else reduce_child(json_node[key])
+            for key, reduce_child in children
+        }
+    return reduce_dict
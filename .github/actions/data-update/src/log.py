@@ -1,21 +1,61 @@
+import time
 import traceback
 import sys
 
-import util
+import consts
 from datetime import datetime
 
+# Priority of each log level. Messages below the minimum level are discarded.
+_LEVEL_PRIORITIES = {
+    "INFO": 0,
+    "WARN": 1,
+    "ERR!": 2,
+    "TBCK": 2,
+    "DONE": 2,
+    "HALT": 2,
+}
 
-def _log_message(level, tag, msg, stderr=False):
+_min_priority = _LEVEL_PRIORITIES[consts.LOG_LEVEL]
+
+# Time format pattern for log timestamps, resolved once at import.
+_TIME_FORMAT = consts.TIME_FORMAT_PATTERN
+
+# Most recently formatted timestamp and the epoch second it represents.
+_last_timestamp_sec = None
+_last_timestamp = ""
+
+
+def set_min_level(level):
     """
-    Log to console and to file if one is being used.
+    Set the minimum level of messages to be logged.
+    :param level: log level (4-character string)
+    """
+    global _min_priority
+    _min_priority = _LEVEL_PRIORITIES[level]
+
+
+def _log_message(level, tag, msg, *args, stderr=False, flush=False):
+    """
+    Log to console and to file if one is being used. Output is buffered unless flushing is requested, or the message
+    goes to stderr. Messages below the minimum log level are discarded before being formatted.
     :param level: log level (4-character string)
     :param tag: log location identifier (4-character string)
-    :param msg: message to be logged
+    :param msg: message to be logged, may contain %-style placeholders
+    :param args: arguments for the placeholders in msg
     :param stderr: whether to log to stderr instead of stdout (False)
+    :param flush: whether to flush the output immediately (False)
     """
+    if _LEVEL_PRIORITIES[level] < _min_priority:
+        return
+    if args:
+        msg = msg % args
     assembled_msg = f"[{timestamp()}] [{level}] [{tag}] {msg}"
-    file = sys.stderr if stderr else sys.stdout
-    print(assembled_msg, file=file)
+    if stderr:
+        # Emit buffered stdout messages first, to keep the output in order.
+        sys.stdout.flush()
+        print(assembled_msg, file=sys.stderr, flush=True)
+    else:
+        print(assembled_msg, file=sys.stdout, flush=flush)
 
 
 def _terminate(exit_code):
@@ -23,42 +63,52 @@ def _terminate(exit_code):
     Terminate the application with the given exit code, performing all necessary pre-shutdown steps.
     :param exit_code: exit code to be used
     """
+    sys.stdout.flush()
     exit(exit_code)
 
 
 def timestamp():
     """
-    Get formatted local date and time.
+    Get formatted local date and time. The formatted value is reused for all calls within the same second, which
+    relies on the time format pattern having at most second granularity.
     :return: formatted local date and time
     """
-    return datetime.now().strftime(util.get_time_format_pattern())
+    global _last_timestamp_sec, _last_timestamp
+    now_sec = int(time.time())
+    if now_sec != _last_timestamp_sec:
+        _last_timestamp_sec = now_sec
+        _last_timestamp = datetime.fromtimestamp(now_sec).strftime(_TIME_FORMAT)
+    return _last_timestamp
 
 
-def info(tag, msg):
+def info(tag, msg, *args):
     """
     Log an info-level message to stdout and to log file if applicable.
     :param tag: log location identifier (4-character string)
-    :param msg: message to be logged
+    :param msg: message to be logged, may contain %-style placeholders
+    :param args: arguments for the placeholders in msg
     """
-    _log_message("INFO", tag, msg)
+    _log_message("INFO", tag, msg, *args)
 
 
-def warning(tag, msg):
+def warning(tag, msg, *args):
     """
     Log a warning-level message to stdout and to log file if applicable.
     :param tag: log location identifier (4-character string)
-    :param msg: message to be logged
+    :param msg: message to be logged, may contain %-style placeholders
+    :param args: arguments for the placeholders in msg
     """
-    _log_message("WARN", tag, msg)
+    _log_message("WARN", tag, msg, *args, flush=True)
 
 
-def error(tag, msg):
+def error(tag, msg, *args):
     """
     Log an error-level message to stderr and to log file if applicable.
     :param tag: log location identifier (4-character string)
-    :param msg: message to be logged
+    :param msg: message to be logged, may contain %-style placeholders
+    :param args: arguments for the placeholders in msg
     """
-    _log_message("ERR!", tag, msg, stderr=True)
+    _log_message("ERR!", tag, msg, *args, stderr=True)
 
 
 def unhandled_exception_exit(tag, exception):
@@ -1,3 +1,5 @@
+import argparse
+
 import jobs
 import log
 import util
@@ -18,9 +20,25 @@ def run_jobs(context, github_api):
     util.log_rate_limit_status("MAIN", github_api)
 
 
+def parse_args():
+    """
+    Parse command line arguments.
+    :return: parsed arguments namespace
+    """
+    parser = argparse.ArgumentParser(description="Update contributions & people from the GitHub API.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not use or update the API response cache (conditional requests)")
+    parser.add_argument("--quiet", action="store_true", help="only log warnings and errors")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.quiet:
+        log.set_min_level("WARN")
+
     # Set up context and API wrappers.
-    context = Context.create()
+    context = Context.create(use_cache=not args.no_cache)
     github_api = GitHubApi(context)
 
     # Run jobs.
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache_store import CacheStore
+
+
+class TestCacheStore(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._cache_dir_path = Path(self._tmp_dir.name).joinpath("cache")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test__get__unknown_url__should_return_none(self):
+        store = CacheStore(self._cache_dir_path)
+        self.assertIsNone(store.get("https://example.com/a"))
+
+    def test__put__with_etag__should_return_entry(self):
+        store = CacheStore(self._cache_dir_path)
+        store.put("https://example.com/a", '"abc"', None, [{"id": 1}], None)
+        expected = {
+            "etag": '"abc"',
+            "last_modified": None,
+            "body": [{"id": 1}],
+            "link_header": None
+        }
+        self.assertEqual(expected, store.get("https://example.com/a"))
+
+    def test__put__without_validators__should_not_store(self):
+        store = CacheStore(self._cache_dir_path)
+        store.put("https://example.com/a", None, None, [{"id": 1}], None)
+        self.assertIsNone(store.get("https://example.com/a"))
+
+    def test__save__new_store__should_restore_entries(self):
+        store = CacheStore(self._cache_dir_path)
+        store.put("https://example.com/a", None, "Tue, 01 Dec 2020 10:00:00 GMT", {"id": 1}, '<x>; rel="next"')
+        store.save()
+        restored = CacheStore(self._cache_dir_path)
+        self.assertEqual(store.get("https://example.com/a"), restored.get("https://example.com/a"))
+
+    def test__save__no_changes__should_not_write_file(self):
+        store = CacheStore(self._cache_dir_path)
+        store.save()
+        self.assertFalse(self._cache_dir_path.joinpath("responses.json").exists())
+
+    def test__init__corrupt_cache_file__should_start_empty(self):
+        self._cache_dir_path.mkdir()
+        self._cache_dir_path.joinpath("responses.json").write_text("{not json", encoding="utf-8")
+        store = CacheStore(self._cache_dir_path)
+        self.assertIsNone(store.get("https://example.com/a"))
@@ -0,0 +1,225 @@
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+import github_api
+
+RATE_LIMIT_HEADERS = {
+    "X-RateLimit-Limit": "5000",
+    "X-RateLimit-Remaining": "4999",
+    "X-RateLimit-Reset": str(int(time.time()) + 3600),
+}
+
+
+class FakeContext:
+
+    def get_github_token(self):
+        return "token"
+
+    def get_cache_dir_path(self):
+        return None
+
+
+class TestGitHubApi(unittest.TestCase):
+
+    def setUp(self):
+        self._responses = []
+        self._requests = []
+        self._sleep = mock.AsyncMock()
+        self._api = github_api.GitHubApi(FakeContext())
+        transport = httpx.MockTransport(self._handle_request)
+        create_client = httpx.AsyncClient
+        patches = [
+            mock.patch("github_api.httpx.AsyncClient", side_effect=lambda **_: create_client(transport=transport)),
+            mock.patch("github_api.asyncio.sleep", new=self._sleep),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _handle_request(self, request):
+        if request.url.path == "/rate_limit":
+            rate = {"limit": 5000, "used": 1, "remaining": 4999, "reset": int(time.time()) + 3600}
+            return httpx.Response(200, json={"rate": rate})
+        self._requests.append(request)
+        response = self._responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def _get(self, url):
+        return self._api._run(self._api._get(url))
+
+    def test__get__retry_after__should_retry_and_succeed(self):
+        # Waiting for a rate limit is not a retry, this must succeed even without any retries.
+        self._api._max_retries = 0
+        self._responses = [
+            httpx.Response(429, headers={**RATE_LIMIT_HEADERS, "Retry-After": "1"}, json={"message": "slow down"}),
+            httpx.Response(200, headers=RATE_LIMIT_HEADERS, json={"id": 1}),
+        ]
+        status, data, _ = self._get("https://api.github.com/users/jondoe")
+        self.assertEqual(200, status)
+        self.assertEqual({"id": 1}, data)
+        self.assertEqual(2, len(self._requests))
+
+    def test__get__transient_error__should_back_off_and_succeed(self):
+        self._responses = [
+            httpx.Response(503, headers=RATE_LIMIT_HEADERS, json={"message": "unavailable"}),
+            httpx.Response(200, headers=RATE_LIMIT_HEADERS, json={"id": 1}),
+        ]
+        status, data, _ = self._get("https://api.github.com/users/jondoe")
+        self.assertEqual(200, status)
+        self.assertEqual({"id": 1}, data)
+        self.assertEqual(2, len(self._requests))
+
+    def test__get__timeout__should_back_off_and_succeed(self):
+        self._responses = [
+            httpx.ReadTimeout("timed out"),
+            httpx.Response(200, headers=RATE_LIMIT_HEADERS, json={"id": 1}),
+        ]
+        status, data, _ = self._get("https://api.github.com/users/jondoe")
+        self.assertEqual(200, status)
+        self.assertEqual({"id": 1}, data)
+        self.assertEqual(2, len(self._requests))
+
+    def test__get__connection_errors__should_abort_after_max_retries(self):
+        self._api._max_retries = 1
+        self._responses = [httpx.ConnectError("refused"), httpx.ConnectError("refused")]
+        with self.assertRaises(SystemExit):
+            self._get("https://api.github.com/users/jondoe")
+        self.assertEqual(2, len(self._requests))
+
+    def test__get__transient_error_with_html_body__should_retry_and_succeed(self):
+        self._responses = [
+            httpx.Response(502, headers={"Content-Type": "text/html"}, content=b"<html>Bad Gateway</html>"),
+            httpx.Response(200, headers=RATE_LIMIT_HEADERS, json={"id": 1}),
+        ]
+        status, data, _ = self._get("https://api.github.com/users/jondoe")
+        self.assertEqual(200, status)
+        self.assertEqual({"id": 1}, data)
+
+    def test__get__unrecoverable_status__should_abort_without_retry(self):
+        self._responses = [
+            httpx.Response(404, headers=RATE_LIMIT_HEADERS, json={"message": "Not Found"}),
+        ]
+        with self.assertRaises(SystemExit):
+            self._get("https://api.github.com/users/nobody")
+        self.assertEqual(1, len(self._requests))
+
+    def test__gather__failing_coroutine__should_cancel_others_and_raise(self):
+        cancelled = []
+
+        async def fail():
+            raise github_api.GitHubApiError("failed")
+
+        async def wait_forever():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def gather():
+            await github_api.GitHubApi._gather([wait_forever(), fail()])
+
+        with self.assertRaises(github_api.GitHubApiError):
+            asyncio.run(gather())
+        self.assertEqual([True], cancelled)
+
+    def test__get_page_urls__last_link__should_list_following_pages(self):
+        expected = [
+            "https://api.github.com/orgs/x/repos?per_page=100&q=&page=2",
+            "https://api.github.com/orgs/x/repos?per_page=100&q=&page=3",
+        ]
+        actual = github_api.GitHubApi._get_page_urls("https://api.github.com/orgs/x/repos?per_page=100&q=&page=3")
+        self.assertEqual(expected, actual)
+
+    def test__get_page_urls__non_numeric_page__should_return_none(self):
+        actual = github_api.GitHubApi._get_page_urls("https://api.github.com/orgs/x/repos?page=abc")
+        self.assertIsNone(actual)
+
+    def test__parse_link_header__all_relations__should_map_urls(self):
+        link_header = ('<https://api.github.com/x?page=3>; rel="next", <https://api.github.com/x?page=5>; rel="last", '
+                       '<https://api.github.com/x?page=1>; rel="first", <https://api.github.com/x?page=1>; rel="prev"')
+        expected = {
+            "next": "https://api.github.com/x?page=3",
+            "last": "https://api.github.com/x?page=5",
+            "first": "https://api.github.com/x?page=1",
+            "prev": "https://api.github.com/x?page=1"
+        }
+        self.assertEqual(expected, github_api.GitHubApi._parse_link_header(link_header))
+
+    def test__parse_link_header__no_header__should_return_empty_cursor(self):
+        expected = {
+            "next": None,
+            "last": None,
+            "first": None,
+            "prev": None
+        }
+        self.assertEqual(expected, github_api.GitHubApi._parse_link_header(None))
+
+    def test__fetch_all_pages__single_page_without_link_header__should_return_page(self):
+        self._responses = [
+            httpx.Response(200, headers=RATE_LIMIT_HEADERS, json=[{"id": 1}, {"id": 2}]),
+        ]
+        actual = self._api._run(self._api._fetch_all_pages("https://api.github.com/orgs/x/repos", flatten=True))
+        self.assertEqual([{"id": 1}, {"id": 2}], actual)
+        self.assertEqual(1, len(self._requests))
+
+    def test__collect_org_members_graphql__should_map_nodes_and_sort_by_login(self):
+        graphql_headers = {**RATE_LIMIT_HEADERS, "X-RateLimit-Remaining": "42", "X-RateLimit-Resource": "graphql"}
+        pages = [
+            ([{"databaseId": 2, "login": "zed", "name": "Zed", "bio": "", "avatarUrl": "a2", "url": "h2"}], True),
+            ([{"databaseId": 1, "login": "Amy", "name": None, "bio": "Hi", "avatarUrl": "a1", "url": "h1"}], False),
+        ]
+        self._responses = [
+            httpx.Response(200, headers=graphql_headers, json={"data": {"organization": {"membersWithRole": {
+                "nodes": nodes,
+                "pageInfo": {"endCursor": "c", "hasNextPage": has_next_page}
+            }}}})
+            for nodes, has_next_page in pages
+        ]
+        expected = [
+            {"id": 1, "login": "Amy", "name": None, "bio": "Hi", "avatar_url": "a1", "html_url": "h1"},
+            {"id": 2, "login": "zed", "name": "Zed", "bio": None, "avatar_url": "a2", "html_url": "h2"},
+        ]
+        actual = self._api._run(self._api._collect_org_members_graphql())
+        self.assertEqual(expected, actual)
+        self.assertEqual(2, len(self._requests))
+        # The GraphQL budget must not be mistaken for the core rate limit.
+        self.assertNotIn("core", self._api._rate_limit_statuses)
+        self.assertEqual(42, self._api._rate_limit_statuses["graphql"]["remaining"])
+
+    def test__post_graphql__core_rate_limit_exhausted__should_not_wait(self):
+        self._api._rate_limit_statuses["core"] = github_api.GitHubApi._parse_rate_limit_headers(
+            {**RATE_LIMIT_HEADERS, "X-RateLimit-Remaining": "0"})
+        self._responses = [
+            httpx.Response(200, headers={**RATE_LIMIT_HEADERS, "X-RateLimit-Resource": "graphql"},
+                           json={"data": {"viewer": None}}),
+        ]
+        actual = self._api._run(self._api._post_graphql("query { viewer { login } }", {}))
+        self.assertEqual({"viewer": None}, actual)
+        self._sleep.assert_not_awaited()
+
+    def test__post_graphql__graphql_rate_limit_exhausted__should_wait_and_succeed(self):
+        graphql_headers = {**RATE_LIMIT_HEADERS, "X-RateLimit-Resource": "graphql"}
+        self._responses = [
+            httpx.Response(403, headers={**graphql_headers, "X-RateLimit-Remaining": "0"},
+                           json={"message": "API rate limit exceeded"}),
+            httpx.Response(200, headers=graphql_headers, json={"data": {"viewer": None}}),
+        ]
+        actual = self._api._run(self._api._post_graphql("query { viewer { login } }", {}))
+        self.assertEqual({"viewer": None}, actual)
+        self.assertEqual(2, len(self._requests))
+        self._sleep.assert_awaited()
+        self.assertNotIn("core", self._api._rate_limit_statuses)
+
+    def test__post_graphql__empty_response__should_abort(self):
+        self._responses = [
+            httpx.Response(204, headers={**RATE_LIMIT_HEADERS, "X-RateLimit-Resource": "graphql"}),
+        ]
+        with self.assertRaises(SystemExit):
+            self._api._run(self._api._post_graphql("query { viewer { login } }", {}))
@@ -578,3 +578,62 @@ class TestJsonReducer(unittest.TestCase):
         ]
         actual = json_reducer.reduce(schema, json_node)
         self.assertEqual(expected, actual)
+
+    def test__compile_schema__nested_list__should_equal_reduce(self):
+        schema = [{
+            "id": {},
+            "person": {
+                "name": {
+                    "first": {}
+                },
+                "tags": []
+            }
+        }]
+        json_node = [
+            {
+                "id": "1234",
+                "person": {
+                    "name": {
+                        "first": "Jon",
+                        "last": "Doe"
+                    },
+                    "tags": ["a", "b"],
+                    "age": 42
+                }
+            },
+            {
+                "id": "5678",
+                "person": {
+                    "name": {
+                        "first": "Jane",
+                        "last": "Doe"
+                    },
+                    "tags": [],
+                    "age": 85
+                }
+            }
+        ]
+        expected = json_reducer.reduce(schema, json_node)
+        actual = json_reducer.compile_schema(schema)(json_node)
+        self.assertEqual(expected, actual)
+
+    def test__compile_schema__empty_schema__should_select_all(self):
+        json_node = {
+            "id": "1234",
+            "title": "hello-world"
+        }
+        actual = json_reducer.compile_schema({})(json_node)
+        self.assertEqual(json_node, actual)
+
+    def test__compile_schema__same_schema__should_return_cached_reducer(self):
+        schema = {
+            "name": {}
+        }
+        self.assertIs(json_reducer.compile_schema(schema), json_reducer.compile_schema(schema))
+
+    def test__compile_schema__list_schema_non_list_node__should_fail(self):
+        schema = [{
+            "name": {}
+        }]
+        with self.assertRaises(AssertionError):
+            json_reducer.compile_schema(schema)({"name": "Jon Doe"})
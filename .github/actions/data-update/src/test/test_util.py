@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+import util
+
+
+class Counter:
+
+    def __init__(self):
+        self.calls = 0
+        self._ttl_cache = {}
+
+    @util.ttl_cache(60)
+    def count(self):
+        self.calls += 1
+        return self.calls
+
+    @util.ttl_cache(60)
+    def items(self):
+        self.calls += 1
+        return [{"id": 1}]
+
+
+class TestUtil(unittest.TestCase):
+
+    def test__ttl_cache__within_ttl__should_return_memoized_result(self):
+        counter = Counter()
+        self.assertEqual(1, counter.count())
+        self.assertEqual(1, counter.count())
+        self.assertEqual(1, counter.calls)
+
+    def test__ttl_cache__after_ttl__should_recompute(self):
+        counter = Counter()
+        with mock.patch("util.time.monotonic", return_value=1000):
+            counter.count()
+        with mock.patch("util.time.monotonic", return_value=1061):
+            self.assertEqual(2, counter.count())
+
+    def test__ttl_cache__cleared__should_recompute(self):
+        counter = Counter()
+        counter.count()
+        counter._ttl_cache.clear()
+        self.assertEqual(2, counter.count())
+
+    def test__ttl_cache__separate_instances__should_not_share_results(self):
+        first = Counter()
+        second = Counter()
+        first.count()
+        self.assertEqual(1, second.count())
+
+    def test__ttl_cache__mutated_result__should_not_affect_memoized_result(self):
+        counter = Counter()
+        counter.items()[0]["id"] = 2
+        counter.items().append({"id": 3})
+        self.assertEqual([{"id": 1}], counter.items())
+        self.assertEqual(1, counter.calls)
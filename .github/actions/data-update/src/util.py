@@ -1,5 +1,8 @@
+import copy
+import functools
 import time
 
+import consts
 import log
 
 
@@ -12,7 +15,7 @@ def get_time_format_pattern():
     Return default datetime format string.
     :return: default datetime format string
     """
-    return "%Y/%m/%d %H:%M:%S"
+    return consts.TIME_FORMAT_PATTERN
 
 
 def epoch_to_local_datetime(epoch_time):
@@ -35,6 +38,27 @@ def log_rate_limit_status(tag, github_api):
              f"{rl_status['remaining']} calls remaining, resets at {epoch_to_local_datetime(rl_status['reset_at_utc'])}.")
 
 
+def ttl_cache(ttl_sec):
+    """
+    Decorator which memoizes the result of a method without arguments on its instance for a limited time. Results are
+    stored in the _ttl_cache dictionary which the instance must provide, indexed by method name. Clearing that
+    dictionary invalidates them. Callers receive a deep copy of the memoized result, so they may modify it freely.
+    :param ttl_sec: number of seconds for which a result is reused
+    :return: decorator
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            entry = self._ttl_cache.get(method.__name__)
+            now = time.monotonic()
+            if (entry is None) or (entry[1] <= now):
+                entry = (method(self), now + ttl_sec)
+                self._ttl_cache[method.__name__] = entry
+            return copy.deepcopy(entry[0])
+        return wrapper
+    return decorator
+
+
 def ensure_directory(target_path):
     if target_path.exists():
         if target_path.is_file():